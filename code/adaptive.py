@@ -0,0 +1,135 @@
+from random import choices
+from time import perf_counter
+
+import numpy as np
+from numpy.typing import NDArray
+
+from crossover_operators import CROSSOVER_OPERATORS
+from mutation import mutate
+from selection import fitness_calc
+
+
+# Mutation strengths are the number of gene swaps made per mutated chromosome
+MUTATION_STRENGTHS = [1, 2, 4, 8]
+
+
+class OperatorScheduler:
+    """Choose between operators in proportion to their recent productivity.
+
+    Productivity is the fitness improvement an operator produced per second of
+    compute. It is tracked as an exponential moving average so the scheduler can
+    follow the search as it moves from exploration to fine tuning.
+
+    Args:
+        operators (list): Operators that can be chosen.
+        min_probability (float): Every operator keeps at least this probability
+            so that an operator that is currently poor can still be rediscovered.
+        decay (float): Weight given to the previous productivity estimate.
+    """
+
+    def __init__(
+        self,
+        operators: list,
+        min_probability: float = 0.05,
+        decay: float = 0.8,
+    ):
+        if min_probability * len(operators) > 1:
+            raise ValueError("min_probability is too large for the number of operators")
+
+        self.operators = list(operators)
+        self.min_probability = min_probability
+        self.decay = decay
+        self.rates = np.zeros(len(self.operators))
+        self.uses = np.zeros(len(self.operators), dtype=int)
+
+    @property
+    def probabilities(self) -> NDArray:
+        # Operators are chosen uniformly until there is something to go on
+        total = self.rates.sum()
+        if total <= 0:
+            return np.full(len(self.operators), 1 / len(self.operators))
+
+        spare = 1 - self.min_probability * len(self.operators)
+        return self.min_probability + spare * self.rates / total
+
+    def choose(self):
+        # Make sure every operator has been tried before trusting the estimates
+        untried = np.where(self.uses == 0)[0]
+        if untried.shape[0] > 0:
+            return self.operators[untried[0]]
+
+        return choices(self.operators, weights=self.probabilities)[0]
+
+    def record(self, operator, improvement: float, elapsed: float):
+        """Update the productivity estimate of an operator after it has been used.
+
+        Args:
+            operator: Operator that was used.
+            improvement (float): Total fitness improvement it produced (>= 0).
+            elapsed (float): Time in seconds that the operator took.
+        """
+        idx = self.operators.index(operator)
+        rate = max(improvement, 0) / max(elapsed, 1e-9)
+
+        if self.uses[idx] == 0:
+            self.rates[idx] = rate
+        else:
+            self.rates[idx] = self.decay * self.rates[idx] + (1 - self.decay) * rate
+
+        self.uses[idx] += 1
+
+
+class AdaptiveController:
+    """Produce offspring with operators chosen by live productivity statistics.
+
+    Each generation one crossover operator and one mutation strength are
+    chosen. Offspring are scored against their parents and mutants against the
+    offspring they came from, so each operator is credited only with the
+    improvement it made itself. The mutant fitness is returned with the mutants
+    so it doesn't have to be calculated again.
+    """
+
+    def __init__(self, mutation_rate: float = 0.5):
+        self.mutation_rate = mutation_rate
+        self.crossover = OperatorScheduler(list(CROSSOVER_OPERATORS))
+        self.mutation = OperatorScheduler(MUTATION_STRENGTHS)
+
+    def make_offspring(
+        self,
+        parents: list[NDArray],
+        parent_fitness: NDArray,
+        num_offspring: int,
+        units: NDArray,
+        price: NDArray,
+        target: float,
+    ) -> tuple[list[NDArray], NDArray]:
+        # Crossover
+        crossover_name = self.crossover.choose()
+        start = perf_counter()
+        offspring = CROSSOVER_OPERATORS[crossover_name](
+            parents, num_offspring, units, price
+        )
+        offspring_fitness = np.array([fitness_calc(c, price, target) for c in offspring])
+        elapsed = perf_counter() - start
+
+        # Children are compared with the better of the pair that produced them
+        num_pairs = len(offspring) // 2
+        pair_best = np.minimum(
+            parent_fitness[0:2 * num_pairs:2],
+            parent_fitness[1:2 * num_pairs:2],
+        )
+        pair_best = np.repeat(pair_best, 2)
+        improvement = np.clip(pair_best - offspring_fitness, 0, None).sum()
+        self.crossover.record(crossover_name, improvement, elapsed)
+
+        # Mutation (modifies the offspring in place so fitness was taken above)
+        num_swaps = self.mutation.choose()
+        start = perf_counter()
+        mutants = mutate(offspring, self.mutation_rate, num_swaps)
+        mutant_fitness = np.array([fitness_calc(c, price, target) for c in mutants])
+        elapsed = perf_counter() - start
+
+        improvement = np.clip(offspring_fitness - mutant_fitness, 0, None).sum()
+        self.mutation.record(num_swaps, improvement, elapsed)
+
+        return mutants, mutant_fitness
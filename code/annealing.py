@@ -0,0 +1,209 @@
+import pandas as pd
+import numpy as np
+from numpy.random import default_rng
+from numpy.typing import NDArray
+
+from initialise import initialise_population
+from termination import terminate, fitness_bound
+from selection import fitness_calc
+from display import display_hamper
+from fixed_point import GENE_DTYPE, to_fixed_point, from_fixed_point
+
+
+def main(fixed_point: bool = False):
+    # SA Settings
+    num_chains = 64
+    num_steps = 20000
+    start_temp = 500
+    end_temp = 1
+
+    # Problem inputs
+    num_hampers = 25
+    target = 5000
+    item_data = pd.read_csv("../CharityBulkPurchaseList.csv")
+
+    # Every chain starts from its own random solution
+    population = initialise_population(
+        num_hampers,
+        item_data["total units"].tolist(),          # type: ignore
+        num_chains,
+        GENE_DTYPE if fixed_point else None,
+    )
+    price = item_data["price per unit"].values      # type: ignore
+
+    # Terminate once any chain reaches the best possible fitness
+    target_fitness = fitness_bound(
+        price,
+        item_data["total units"].values,            # type: ignore
+        num_hampers,
+        target,
+    )
+
+    # Integer prices keep the incrementally updated fitness exact
+    if fixed_point:
+        price = to_fixed_point(price)
+        target = to_fixed_point(target)
+        target_fitness = to_fixed_point(target_fitness)
+        # Temperatures are in fitness units so they are scaled too, otherwise
+        # moves would be 100 times less likely to be accepted
+        start_temp = to_fixed_point(start_temp)
+        end_temp = to_fixed_point(end_temp)
+
+    best, best_fitness = anneal(
+        population,
+        price,
+        target,
+        num_steps,
+        start_temp,
+        end_temp,
+        target_fitness,
+    )
+
+    best_index = best_fitness.argmin()
+    best_solution = best[best_index]
+
+    print()
+    print("Best Fitness")
+    print(
+        from_fixed_point(best_fitness[best_index])
+        if fixed_point else best_fitness[best_index]
+    )
+
+    for i in range(best_solution.shape[1]):
+        display_hamper(
+            i,
+            best_solution[:, i],
+            item_data["item"].values,
+            item_data["price per unit"].values
+        )
+
+
+def anneal(
+    population: list[NDArray],
+    item_values: NDArray,
+    target_hamper_value: float,
+    num_steps: int,
+    start_temp: float,
+    end_temp: float,
+    target_fitness: float = 0,
+    seed: int | None = None,
+    refresh_every: int = 1000,
+) -> tuple[NDArray, NDArray]:
+    """Run independent simulated annealing chains as one vectorised batch.
+
+    Each step every chain proposes moving a single unit of an item from one
+    hamper to another (the same move as mutation.swap_gene). Only the two
+    hamper values involved change, so the fitness delta is calculated in O(1)
+    rather than re-evaluating the whole chromosome. With float prices the
+    running values pick up rounding error so they are recalculated from the
+    chains every refresh_every steps, and the returned fitness is exact.
+
+    Args:
+        population (list[NDArray]): Starting chromosome for each chain.
+        item_values (NDArray): Value of a single unit of each item.
+        target_hamper_value (float): Value each hamper should be worth.
+        num_steps (int): Number of moves proposed per chain.
+        start_temp (float): Temperature of the first step.
+        end_temp (float): Temperature of the last step (geometric cooling).
+        target_fitness (float): Stop early once any chain reaches this fitness.
+        seed (int | None): Seed for the random number generator.
+        refresh_every (int): Steps between recalculating hamper values.
+    Return:
+        NDArray: Best chromosome found by each chain.
+        NDArray: Fitness of each of the best chromosomes.
+    """
+    rng = default_rng(seed)
+
+    chains = np.array(population)
+    num_chains, num_items, num_hampers = chains.shape
+    chain_idx = np.arange(num_chains)
+
+    # Hamper values are kept up to date so moves can be scored incrementally
+    values, fitness = chain_values(chains, item_values, target_hamper_value)
+
+    best = chains.copy()
+    best_fitness = fitness.copy()
+
+    temps = start_temp * (end_temp / start_temp) ** np.linspace(0, 1, num_steps)
+    for step, temp in enumerate(temps, start=1):
+        # Pick an item and two different hampers for every chain
+        item = rng.integers(num_items, size=num_chains)
+        hamper_a = rng.integers(num_hampers, size=num_chains)
+        hamper_b = (hamper_a + rng.integers(1, num_hampers, size=num_chains))
+        hamper_b %= num_hampers
+
+        # A move is only possible if exactly one of the hampers has the item
+        gene_a = chains[chain_idx, item, hamper_a]
+        gene_b = chains[chain_idx, item, hamper_b]
+        possible = gene_a != gene_b
+
+        # The unit moves from the hamper that has it to the one that doesn't
+        source = np.where(gene_a == 1, hamper_a, hamper_b)
+        dest = np.where(gene_a == 1, hamper_b, hamper_a)
+
+        delta = move_delta(
+            values[chain_idx, source],
+            values[chain_idx, dest],
+            item_values[item],
+            target_hamper_value,
+        )
+
+        # Metropolis criterion
+        accept_prob = np.exp(-np.maximum(delta, 0) / temp)
+        accept = possible & (rng.random(num_chains) < accept_prob)
+
+        moved = chain_idx[accept]
+        chains[moved, item[accept], source[accept]] = 0
+        chains[moved, item[accept], dest[accept]] = 1
+        values[moved, source[accept]] -= item_values[item[accept]]
+        values[moved, dest[accept]] += item_values[item[accept]]
+        fitness[accept] += delta[accept]
+
+        improved = fitness < best_fitness
+        best[improved] = chains[improved]
+        best_fitness[improved] = fitness[improved]
+
+        if terminate(best_fitness.min(), target_fitness):
+            break
+
+        # Stop rounding error building up in the running values
+        if step % refresh_every == 0:
+            values, fitness = chain_values(chains, item_values, target_hamper_value)
+
+    # Best fitness was tracked incrementally so it is recalculated exactly
+    best_fitness = np.array(
+        [fitness_calc(c, item_values, target_hamper_value) for c in best]
+    )
+
+    return best, best_fitness
+
+
+def chain_values(
+    chains: NDArray,
+    item_values: NDArray,
+    target_hamper_value: float,
+) -> tuple[NDArray, NDArray]:
+    """Calculate the hamper values and fitness of every chain from scratch."""
+    values = np.einsum("i,cih->ch", item_values, chains)
+    fitness = np.abs(values - target_hamper_value).sum(axis=1)
+
+    return values, fitness
+
+
+def move_delta(
+    source_values: NDArray,
+    dest_values: NDArray,
+    unit_values: NDArray,
+    target_hamper_value: float,
+) -> NDArray:
+    """Change in fitness from moving a unit between two hampers."""
+    source_before = np.abs(source_values - target_hamper_value)
+    dest_before = np.abs(dest_values - target_hamper_value)
+    source_after = np.abs(source_values - unit_values - target_hamper_value)
+    dest_after = np.abs(dest_values + unit_values - target_hamper_value)
+
+    return source_after + dest_after - source_before - dest_before
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import onepoint_crossover
+import twopoint_crossover
+
+
+def _onepoint(parents, num_offspring, units, price):
+    return onepoint_crossover.crossover(parents, num_offspring, units, price)
+
+
+def _twopoint(parents, num_offspring, units, price):
+    return twopoint_crossover.crossover(parents, num_offspring, units)
+
+
+# Crossover operators share a signature so they can be chosen by name
+CROSSOVER_OPERATORS = {
+    "onepoint": _onepoint,
+    "twopoint": _twopoint,
+}
@@ -0,0 +1,13 @@
+from numpy.typing import NDArray
+
+
+def display_hamper(
+    hamper_num: int,
+    hamper: NDArray,
+    item_names: NDArray,
+    item_values: NDArray
+):
+    hamper_items = item_names[hamper == 1].tolist()
+    hamper_value = (item_values * hamper).sum()
+
+    print(f"{hamper_num}: {int(hamper_value) : >2} - {hamper_items}")
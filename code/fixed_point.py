@@ -0,0 +1,31 @@
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+# Genes are binary so a single byte is plenty. Signed so that unit count
+# differences (e.g. in repair) stay signed when rows are summed.
+GENE_DTYPE = np.int8
+
+# Prices are stored as a whole number of hundredths
+PRICE_DECIMALS = 2
+
+
+def to_fixed_point(values: ArrayLike, decimals: int = PRICE_DECIMALS) -> NDArray:
+    """Convert monetary values to scaled integers.
+
+    Hamper values and fitness calculated from these are exact integers so
+    float noise can't affect sorting or the termination check.
+
+    Args:
+        values (ArrayLike): Prices (or a single price) to convert.
+        decimals (int): Number of decimal places to keep.
+    Return:
+        NDArray: int64 values scaled by 10 ** decimals.
+    """
+    scaled = np.round(np.asarray(values, dtype=np.float64) * 10**decimals)
+    return scaled.astype(np.int64)
+
+
+def from_fixed_point(values: ArrayLike, decimals: int = PRICE_DECIMALS) -> NDArray:
+    """Convert scaled integers back to monetary values for display."""
+    return np.asarray(values) / 10**decimals
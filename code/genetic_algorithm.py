@@ -1,3 +1,5 @@
+from contextlib import nullcontext
+
 from tqdm import tqdm
 import matplotlib.pyplot as plt
 import pandas as pd
@@ -6,73 +8,31 @@ from numpy.typing import NDArray
 
 from initialise import initialise_population
 from selection import fitness_calc, selection
-from termination import terminate
-from twopoint_crossover import crossover
+from termination import terminate, fitness_bound
 from mutation import mutate
+from adaptive import AdaptiveController
+from crossover_operators import CROSSOVER_OPERATORS
+from fixed_point import GENE_DTYPE, to_fixed_point, from_fixed_point
+from parallel import OffspringPool
+from rebalance import rebalance_best
+from display import display_hamper
 
 
-def main():
-    # GA Settings
-    pop_size = 250
-    num_generations = 500
-
-    # Terminate after this many generations with no improvement
-    target_fitness = 1709
-
+def main(adaptive: bool = False, fixed_point: bool = False, num_workers: int = 0):
     # Problem inputs
     num_hampers = 25
     target = 5000
     item_data = pd.read_csv("../CharityBulkPurchaseList.csv")
 
-    # Top half of solutions will be used to create  new solutions
-    num_parents = int(pop_size / 2)
-    num_offspring = pop_size - num_parents
-
-    # Initialise population
-    population = initialise_population(
+    population, fitness, mean_fitness, best_fitness = run(
+        item_data,
         num_hampers,
-        item_data["total units"].tolist(),          # type: ignore
-        pop_size,
+        target,
+        adaptive=adaptive,
+        fixed_point=fixed_point,
+        num_workers=num_workers,
     )
 
-    # Run optimisation loop
-    units = item_data["total units"].values         # type: ignore
-    price = item_data["price per unit"].values      # type: ignore
-
-    mean_fitness = []
-    best_fitness = []
-
-    for _ in tqdm(range(1, num_generations + 1)):
-        # Determine fitness of current generation
-        fitness = np.array([fitness_calc(c, price, target) for c in population])
-
-        best_solution = fitness.min()
-
-        mean_fitness.append(fitness.mean())
-        best_fitness.append(best_solution)
-
-        # Check if termination critera are met
-        if terminate(best_solution, target_fitness):
-            break
-
-        # Select fittest solutions to create new solutions
-        parents = selection(fitness, num_parents, population)
-
-        # Do crossover to produce new solutions
-        offspring = crossover(parents, num_offspring, units)
-
-        for chromosome in offspring:
-            np.testing.assert_array_equal(chromosome.sum(axis=1), units)
-
-        # Mutate some offspring
-        mutants = mutate(offspring, mutation_rate=0.5)
-
-        # Create new population with fittest parents and new solutions
-        population = parents + mutants
-
-    # Determine fitness of current generation
-    fitness = np.array([fitness_calc(c, price, target) for c in population])
-
     best_index = fitness.argmin()
     best_solution = population[best_index]
 
@@ -95,16 +55,287 @@ def main():
     plt.show()
 
 
-def display_hamper(
-    hamper_num: int,
-    hamper: NDArray,
-    item_names: NDArray,
-    item_values: NDArray
+def run(
+    item_data: pd.DataFrame,
+    num_hampers: int,
+    target: float,
+    pop_size: int = 250,
+    num_generations: int = 500,
+    target_fitness: float | None = None,
+    adaptive: bool = False,
+    fixed_point: bool = False,
+    num_workers: int = 0,
+    population: list[NDArray] | None = None,
+    rebalance_every: int = 0,
+    parent_fraction: float = 0.5,
+    mutation_rate: float = 0.5,
+    crossover_name: str = "twopoint",
+    progress: bool = True,
+    seed: int | None = None,
+) -> tuple[list[NDArray], NDArray, list, list]:
+    """Run the genetic algorithm on a set of items.
+
+    Args:
+        item_data (pd.DataFrame): Items with "total units" and "price per unit".
+        num_hampers (int): Number of hampers the items are split between.
+        target (float): Value each hamper should be worth.
+        pop_size (int): Number of solutions in the first generation.
+        num_generations (int): Maximum number of generations.
+        target_fitness (float | None): Stop once a solution is at least this
+            fit. Defaults to the best possible fitness for the items.
+        adaptive (bool): Pick operators with the adaptive controller.
+        fixed_point (bool): Use integer prices and compact genes.
+        num_workers (int): Number of processes used to create offspring.
+        population (list[NDArray] | None): Starting population, e.g. from a
+            previous run. A random population is used if not given.
+        rebalance_every (int): Rebalance hamper pairs of the fittest solution
+            every this many generations (0 to never rebalance).
+        parent_fraction (float): Fraction of the fittest solutions that are
+            kept as parents of the next generation.
+        mutation_rate (float): Probability that an offspring is mutated.
+        crossover_name (str): Crossover operator from CROSSOVER_OPERATORS
+            (ignored in adaptive mode).
+        progress (bool): Show a progress bar.
+        seed (int | None): Seed for the random streams of the worker processes.
+    Return:
+        list[NDArray]: Final population.
+        NDArray: Fitness of the final population.
+        list: Mean fitness of each generation.
+        list: Best fitness of each generation.
+    """
+    population = starting_population(
+        item_data, num_hampers, pop_size, fixed_point, population
+    )
+
+    # Fittest solutions will be used to create new solutions
+    num_parents = int(len(population) * parent_fraction)
+    num_offspring = len(population) - num_parents
+
+    units = item_data["total units"].values         # type: ignore
+    price = item_data["price per unit"].values      # type: ignore
+
+    # The bound moves whenever the total value of the items changes
+    if target_fitness is None:
+        target_fitness = fitness_bound(price, units, population[0].shape[1], target)
+
+    price, target, target_fitness = scale_inputs(
+        price,
+        target,
+        target_fitness,
+        fixed_point,
+    )
+
+    # Adaptive mode picks crossover operator and mutation strength as it goes
+    controller = AdaptiveController(mutation_rate) if adaptive else None
+
+    # Offspring generation and their fitness can be split across processes
+    pool = make_pool(
+        num_workers, num_offspring, population[0], units, price, target,
+        mutation_rate, adaptive, crossover_name, seed,
+    )
+
+    mean_fitness = []
+    best_fitness = []
+
+    # Determine fitness of first generation
+    fitness = np.array([fitness_calc(c, price, target) for c in population])
+
+    with pool or nullcontext():
+        for generation in tqdm(range(1, num_generations + 1), disable=not progress):
+            periodic_rebalance(
+                generation, rebalance_every, population, fitness, price, target
+            )
+
+            best_solution = fitness.min()
+
+            mean_fitness.append(fitness.mean())
+            best_fitness.append(best_solution)
+
+            # Check if termination critera are met
+            if terminate(best_solution, target_fitness):
+                break
+
+            population, fitness = next_generation(
+                population, fitness, num_parents, num_offspring, units, price,
+                target, pool, controller, mutation_rate, crossover_name,
+            )
+
+    return report_fitness(population, fitness, mean_fitness, best_fitness, fixed_point)
+
+
+def starting_population(
+    item_data: pd.DataFrame,
+    num_hampers: int,
+    pop_size: int,
+    fixed_point: bool,
+    population: list[NDArray] | None = None,
+) -> list[NDArray]:
+    gene_dtype = GENE_DTYPE if fixed_point else None
+
+    # A population passed in (e.g. from a previous run) only needs its genes cast
+    if population is not None:
+        return [c.astype(gene_dtype or c.dtype) for c in population]
+
+    return initialise_population(
+        num_hampers,
+        item_data["total units"].tolist(),          # type: ignore
+        pop_size,
+        gene_dtype,
+    )
+
+
+def scale_inputs(
+    price: NDArray,
+    target: float,
+    target_fitness: float,
+    fixed_point: bool,
+) -> tuple[NDArray, float, float]:
+    # Integer prices make fitness exact so sorting and termination are stable
+    if not fixed_point:
+        return price, target, target_fitness
+
+    return (
+        to_fixed_point(price),
+        to_fixed_point(target),
+        to_fixed_point(target_fitness),
+    )
+
+
+def report_fitness(
+    population: list[NDArray],
+    fitness: NDArray,
+    mean_fitness: list,
+    best_fitness: list,
+    fixed_point: bool,
+) -> tuple[list[NDArray], NDArray, list, list]:
+    # Report fitness in the units of the item prices
+    if fixed_point:
+        fitness = from_fixed_point(fitness)
+        mean_fitness = from_fixed_point(mean_fitness).tolist()
+        best_fitness = from_fixed_point(best_fitness).tolist()
+
+    return population, fitness, mean_fitness, best_fitness
+
+
+def make_pool(
+    num_workers: int,
+    num_offspring: int,
+    chromosome: NDArray,
+    units: NDArray,
+    price: NDArray,
+    target: float,
+    mutation_rate: float,
+    adaptive: bool,
+    crossover_name: str,
+    seed: int | None = None,
+) -> OffspringPool | None:
+    if num_workers <= 0:
+        return None
+    if adaptive:
+        raise ValueError("Adaptive mode can't be combined with worker processes")
+    if crossover_name != "twopoint":
+        raise ValueError("Worker processes only support twopoint crossover")
+
+    return OffspringPool(
+        num_workers,
+        num_offspring,
+        num_offspring,
+        chromosome.shape,
+        units,
+        price,
+        target,
+        mutation_rate=mutation_rate,
+        dtype=chromosome.dtype,
+        seed=seed,
+    )
+
+
+def periodic_rebalance(
+    generation: int,
+    rebalance_every: int,
+    population: list[NDArray],
+    fitness: NDArray,
+    price: NDArray,
+    target: float,
 ):
-    hamper_items = item_names[hamper == 1].tolist()
-    hamper_value = (item_values * hamper).sum()
+    # Exact pairwise rebalancing finds moves that mutation rarely does
+    if rebalance_every and generation % rebalance_every == 0:
+        rebalance_best(population, fitness, price, target)
+
+
+def next_generation(
+    population: list[NDArray],
+    fitness: NDArray,
+    num_parents: int,
+    num_offspring: int,
+    units: NDArray,
+    price: NDArray,
+    target: float,
+    pool: OffspringPool | None = None,
+    controller: AdaptiveController | None = None,
+    mutation_rate: float = 0.5,
+    crossover_name: str = "twopoint",
+) -> tuple[list[NDArray], NDArray]:
+    # Select fittest solutions to create new solutions
+    parents = selection(fitness, num_parents, population)
+    parent_fitness = np.sort(fitness)[0:num_parents]
+
+    # Parents are reused in order if there are more offspring than parents
+    mating = np.arange(num_offspring) % num_parents
+    mating_parents = [parents[i] for i in mating]
+
+    if pool is not None:
+        mutants, mutant_fitness = pool.make_offspring(mating_parents)
+    else:
+        mutants, mutant_fitness = breed(
+            mating_parents, parent_fitness[mating], num_offspring, units,
+            price, target, controller, mutation_rate, crossover_name,
+        )
+
+    # Create new population with fittest parents and new solutions
+    return parents + mutants, np.concatenate([parent_fitness, mutant_fitness])
+
+
+def breed(
+    parents: list[NDArray],
+    parent_fitness: NDArray,
+    num_offspring: int,
+    units: NDArray,
+    price: NDArray,
+    target: float,
+    controller: AdaptiveController | None = None,
+    mutation_rate: float = 0.5,
+    crossover_name: str = "twopoint",
+) -> tuple[list[NDArray], NDArray]:
+    # The adaptive controller scores mutants itself to credit its operators
+    if controller is not None:
+        return controller.make_offspring(
+            parents, parent_fitness, num_offspring, units, price, target
+        )
+
+    mutants = make_offspring(
+        parents, num_offspring, units, price, mutation_rate, crossover_name
+    )
+    return mutants, np.array([fitness_calc(c, price, target) for c in mutants])
+
+
+def make_offspring(
+    parents: list[NDArray],
+    num_offspring: int,
+    units: NDArray,
+    price: NDArray,
+    mutation_rate: float = 0.5,
+    crossover_name: str = "twopoint",
+) -> list[NDArray]:
+    # Do crossover to produce new solutions
+    crossover = CROSSOVER_OPERATORS[crossover_name]
+    offspring = crossover(parents, num_offspring, units, price)
+
+    for chromosome in offspring:
+        np.testing.assert_array_equal(chromosome.sum(axis=1), units)
 
-    print(f"{hamper_num}: {int(hamper_value) : >2} - {hamper_items}")
+    # Mutate some offspring
+    return mutate(offspring, mutation_rate=mutation_rate)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,12 @@
 import numpy as np
+from numpy.typing import DTypeLike
 
 
-def randomly_distribute_item(num_hampers: int, num_units: int) -> np.ndarray:
+def randomly_distribute_item(
+    num_hampers: int,
+    num_units: int,
+    dtype: DTypeLike = None,
+) -> np.ndarray:
     """Randomly create array representing the assignments of a single item.
 
     - This is a single row in the chromosome
@@ -11,6 +16,7 @@ def randomly_distribute_item(num_hampers: int, num_units: int) -> np.ndarray:
     Args:
         num_hampers (int): Number of hampers that will be made.
         num_units (int): Number of units that are available for an item
+        dtype (DTypeLike): Data type of the genes (default integer)
     Returns:
         np.ndarray: Array of binary values with length of num_hampers + num_units
             containing num_units of 1s
@@ -20,7 +26,7 @@ def randomly_distribute_item(num_hampers: int, num_units: int) -> np.ndarray:
 
     # Want the number of zeros in the hamper to be equal to the number of units
     # of an item
-    item_arr = np.array([0] * num_zeros + [1] * num_units)
+    item_arr = np.array([0] * num_zeros + [1] * num_units, dtype=dtype)
 
     # Distribution amongst hampers should be random so we have multiple different
     # solutions
@@ -30,21 +36,35 @@ def randomly_distribute_item(num_hampers: int, num_units: int) -> np.ndarray:
     return item_arr
 
 
-def make_random_chromosome(num_hampers: int, units: list[int]) -> np.ndarray:
+def make_random_chromosome(
+    num_hampers: int,
+    units: list[int],
+    dtype: DTypeLike = None,
+) -> np.ndarray:
     """Make a single randomised chromosome for the hamper problem GA.
 
     Args:
         num_hampers (int): Number of hampers that will be created.
         units (list[int]): List containing number of each item that is available
+        dtype (DTypeLike): Data type of the genes (default integer)
 
     returns:
         np.ndarray: Chromome made up of randomised binary arrays for each item
     """
-    chromosome = [randomly_distribute_item(num_hampers, num_units) for num_units in units]
+    chromosome = [
+        randomly_distribute_item(num_hampers, num_units, dtype) for num_units in units
+    ]
 
-    return np.array(chromosome)
+    return np.array(chromosome, dtype=dtype)
 
 
-def initialise_population(num_hampers: int, item_amounts: list, pop_size: int) -> list:
-    return [make_random_chromosome(num_hampers, item_amounts) for _ in range(pop_size)]
+def initialise_population(
+    num_hampers: int,
+    item_amounts: list,
+    pop_size: int,
+    dtype: DTypeLike = None,
+) -> list:
+    return [
+        make_random_chromosome(num_hampers, item_amounts, dtype) for _ in range(pop_size)
+    ]
 
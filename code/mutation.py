@@ -4,14 +4,21 @@ import numpy as np
 from numpy.typing import NDArray
 
 
-def mutate(offspring: list[NDArray], mutation_rate: float) -> list[NDArray]:
+def mutate(
+    offspring: list[NDArray],
+    mutation_rate: float,
+    num_swaps: int = 1,
+) -> list[NDArray]:
     mutants = []
     for chromosome in offspring:
         # Mutate a chromosome in line with the desired mutation rate
         if uniform(0, 1) > mutation_rate:
             mutants.append(chromosome)
+            continue
 
-        chromosome = swap_gene(chromosome)
+        # Stronger mutations make several swaps to help escape stagnation
+        for _ in range(num_swaps):
+            chromosome = swap_gene(chromosome)
         mutants.append(chromosome)
 
     return mutants
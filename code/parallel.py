@@ -0,0 +1,177 @@
+import random
+from multiprocessing import Pool, Queue
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from numpy.random import SeedSequence
+from numpy.typing import DTypeLike, NDArray
+
+from mutation import mutate
+from selection import fitness_calc
+from twopoint_crossover import cross_and_repair
+
+
+# Shared buffers and problem data attached to each worker by _init_worker
+_worker = {}
+
+
+class OffspringPool:
+    """Persistent process pool that creates offspring in shared memory.
+
+    Parents, offspring and offspring fitness live in shared memory blocks that
+    every worker maps as numpy arrays. Only pair indices are sent to the
+    workers so no chromosome arrays are pickled between processes. Each worker
+    seeds its own random number generator from a spawned SeedSequence so the
+    workers produce independent random streams.
+
+    Args:
+        num_workers (int): Number of worker processes.
+        num_parents (int): Number of parents passed to make_offspring.
+        num_offspring (int): Number of offspring to create from the parents.
+        chromosome_shape (tuple[int, int]): Shape of a single chromosome.
+        units (NDArray): Number of units available for each item.
+        item_values (NDArray): Value of a single unit of each item.
+        target_hamper_value (float): Value each hamper should be worth.
+        mutation_rate (float): Probability that an offspring is mutated.
+        dtype (DTypeLike): Data type of the genes.
+        seed (int | None): Seed used to create the worker seeds.
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        num_parents: int,
+        num_offspring: int,
+        chromosome_shape: tuple[int, int],
+        units: NDArray,
+        item_values: NDArray,
+        target_hamper_value: float,
+        mutation_rate: float = 0.5,
+        dtype: DTypeLike = np.int64,
+        seed: int | None = None,
+    ):
+        # Crossover works on pairs of parents so an odd offspring is dropped
+        self.num_pairs = num_offspring // 2
+        offspring_shape = (2 * self.num_pairs, *chromosome_shape)
+        # A fractional target needs a float buffer even with integer prices
+        fitness_dtype = np.result_type(
+            np.asarray(item_values), target_hamper_value, np.int64
+        )
+
+        parents_shape = (num_parents, *chromosome_shape)
+
+        self._blocks = {}
+        # Blocks outlive the process unless unlinked so any made before a
+        # failure are released before the error is raised
+        try:
+            self.parents = self._create("parents", parents_shape, dtype)
+            self.offspring = self._create("offspring", offspring_shape, dtype)
+            self.fitness = self._create("fitness", (2 * self.num_pairs,), fitness_dtype)
+
+            # Every worker takes one seed from the queue when it starts
+            seeds = Queue()
+            for child in SeedSequence(seed).spawn(num_workers):
+                seeds.put(int(child.generate_state(1)[0]))
+
+            buffers = {
+                name: (block.name, array.shape, array.dtype)
+                for name, (block, array) in self._blocks.items()
+            }
+            self._pool = Pool(
+                num_workers,
+                initializer=_init_worker,
+                initargs=(
+                    seeds,
+                    buffers,
+                    units,
+                    item_values,
+                    target_hamper_value,
+                    mutation_rate,
+                ),
+            )
+        except BaseException:
+            self._release_blocks()
+            raise
+
+        # Split pairs evenly between the workers
+        self._chunks = np.array_split(np.arange(self.num_pairs), num_workers)
+
+    def _create(self, name: str, shape: tuple, dtype: DTypeLike) -> NDArray:
+        dtype = np.dtype(dtype)
+        size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        block = SharedMemory(create=True, size=size)
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        self._blocks[name] = (block, array)
+
+        return array
+
+    def make_offspring(self, parents: list[NDArray]) -> tuple[list[NDArray], NDArray]:
+        """Create mutated offspring from consecutive pairs of parents.
+
+        Args:
+            parents (list[NDArray]): Parents sorted from fittest to least fit.
+        Return:
+            list[NDArray]: Mutated offspring.
+            NDArray: Fitness of each offspring.
+        """
+        self.parents[:] = parents
+        self._pool.map(_breed_pairs, [chunk for chunk in self._chunks if chunk.size])
+
+        # Copies so the next generation can reuse the shared buffers
+        return list(self.offspring.copy()), self.fitness.copy()
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+        self._release_blocks()
+
+    def _release_blocks(self):
+        for block, _ in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _init_worker(
+    seeds: Queue,
+    buffers: dict,
+    units: NDArray,
+    item_values: NDArray,
+    target_hamper_value: float,
+    mutation_rate: float,
+):
+    # Workers forked from the same process would otherwise share random state
+    random.seed(seeds.get())
+
+    for name, (block_name, shape, dtype) in buffers.items():
+        block = SharedMemory(name=block_name)
+        _worker[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        # Keep the block open for as long as the worker uses the array
+        _worker[f"{name}_block"] = block
+
+    _worker["units"] = units
+    _worker["item_values"] = item_values
+    _worker["target"] = target_hamper_value
+    _worker["mutation_rate"] = mutation_rate
+
+
+def _breed_pairs(pair_indices: NDArray):
+    parents = _worker["parents"]
+    offspring = _worker["offspring"]
+    fitness = _worker["fitness"]
+
+    for i in pair_indices:
+        children = cross_and_repair(parents[2 * i], parents[2 * i + 1], _worker["units"])
+        mutants = mutate(list(children), _worker["mutation_rate"])
+
+        for j, chromosome in zip((2 * i, 2 * i + 1), mutants):
+            offspring[j] = chromosome
+            fitness[j] = fitness_calc(
+                chromosome, _worker["item_values"], _worker["target"]
+            )
@@ -0,0 +1,165 @@
+from itertools import combinations
+from math import gcd
+
+import numpy as np
+from numpy.typing import NDArray
+
+from fixed_point import to_fixed_point
+from selection import fitness_calc
+
+
+def rebalance(
+    chromosome: NDArray,
+    item_values: NDArray,
+    target_hamper_value: float,
+    max_passes: int = 10,
+) -> NDArray:
+    """Improve a solution by optimally redistributing items between hamper pairs.
+
+    Every pair of hampers is rebalanced in turn. Passes over all pairs are
+    repeated until a pass makes no improvement. Prices are converted to
+    integers once up front (see integer_prices).
+
+    Args:
+        chromosome (NDArray): Solution to improve (not modified).
+        item_values (NDArray): Value of a single unit of each item.
+        target_hamper_value (float): Value each hamper should be worth.
+        max_passes (int): Maximum number of passes over all pairs.
+    Return:
+        NDArray: Improved solution.
+    """
+    chromosome = chromosome.copy()
+    pairs = list(combinations(range(chromosome.shape[1]), 2))
+    prices, target = integer_prices(item_values, target_hamper_value)
+
+    for _ in range(max_passes):
+        improved = [
+            rebalance_pair(chromosome, a, b, prices, target)
+            for a, b in pairs
+        ]
+        if not any(improved):
+            break
+
+    return chromosome
+
+
+def rebalance_best(
+    population: list[NDArray],
+    fitness: NDArray,
+    item_values: NDArray,
+    target_hamper_value: float,
+):
+    """Rebalance the fittest solution of a population in place.
+
+    Rebalancing works on prices rounded to hundredths so the solution is only
+    replaced if it is fitter at the real prices.
+    """
+    best_index = fitness.argmin()
+    candidate = rebalance(population[best_index], item_values, target_hamper_value)
+    candidate_fitness = fitness_calc(candidate, item_values, target_hamper_value)
+
+    if candidate_fitness < fitness[best_index]:
+        population[best_index] = candidate
+        fitness[best_index] = candidate_fitness
+
+
+def integer_prices(item_values: NDArray, target_hamper_value: float) -> tuple:
+    """Get integer prices and target for indexing the dynamic program.
+
+    Integer prices (e.g. already in fixed point) are used as they are, anything
+    else is converted to fixed point.
+    """
+    item_values = np.asarray(item_values)
+    is_integer = np.issubdtype(item_values.dtype, np.integer)
+
+    if is_integer and float(target_hamper_value).is_integer():
+        return item_values, int(target_hamper_value)
+
+    return to_fixed_point(item_values), to_fixed_point(target_hamper_value)
+
+
+def rebalance_pair(
+    chromosome: NDArray,
+    hamper_a: int,
+    hamper_b: int,
+    prices: NDArray,
+    target: int,
+) -> bool:
+    """Optimally redistribute the items of two hampers between them.
+
+    - Items that are in both hampers stay in both (no duplicates allowed)
+    - Items that are in one of the hampers can go in either
+    - The best split of these items is found exactly with a subset-sum dynamic
+      program over integer prices
+
+    Args:
+        chromosome (NDArray): Solution to modify in place.
+        hamper_a (int): Index of the first hamper.
+        hamper_b (int): Index of the second hamper.
+        prices (NDArray): Integer value of a single unit of each item.
+        target (int): Integer value each hamper should be worth.
+    Return:
+        bool: True if the hampers were changed.
+    """
+    genes_a = chromosome[:, hamper_a]
+    genes_b = chromosome[:, hamper_b]
+    free = np.nonzero(genes_a != genes_b)[0]
+    if free.shape[0] == 0:
+        return False
+
+    shared_value = prices[(genes_a == 1) & (genes_b == 1)].sum()
+    total_value = 2 * shared_value + prices[free].sum()
+
+    # Dividing by the common factor keeps the dynamic program small
+    step = gcd(*prices[free].tolist()) or 1
+    weights = prices[free] // step
+    reachable = subset_sums(weights)
+
+    # Value of hamper a for every split that is possible
+    sums = np.nonzero(reachable[-1])[0]
+    value_a = shared_value + sums * step
+    cost = np.abs(value_a - target) + np.abs(total_value - value_a - target)
+
+    current = weights[genes_a[free] == 1].sum()
+    current_cost = cost[np.searchsorted(sums, current)]
+    if cost.min() >= current_cost:
+        return False
+
+    in_a = backtrack(reachable, weights, sums[cost.argmin()])
+    chromosome[free, hamper_a] = in_a
+    chromosome[free, hamper_b] = 1 - in_a
+
+    return True
+
+
+def subset_sums(weights: NDArray) -> NDArray:
+    """Find the sums that can be made from each prefix of the weights.
+
+    Args:
+        weights (NDArray): Non-negative integer weights.
+    Return:
+        NDArray: Boolean array where [k, s] is True if s can be made from a
+            subset of the first k weights.
+    """
+    max_sum = int(weights.sum())
+    reachable = np.zeros((weights.shape[0] + 1, max_sum + 1), dtype=bool)
+    reachable[0, 0] = True
+
+    for k, weight in enumerate(weights):
+        reachable[k + 1, :] = reachable[k, :]
+        reachable[k + 1, weight:] |= reachable[k, 0:max_sum + 1 - weight]
+
+    return reachable
+
+
+def backtrack(reachable: NDArray, weights: NDArray, total: int) -> NDArray:
+    """Recover which weights make up a reachable sum."""
+    chosen = np.zeros(weights.shape[0], dtype=int)
+
+    for k in range(weights.shape[0], 0, -1):
+        # If the sum could be made without this weight it isn't needed
+        if not reachable[k - 1, total]:
+            chosen[k - 1] = 1
+            total -= weights[k - 1]
+
+    return chosen
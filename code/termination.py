@@ -12,3 +12,17 @@ def terminate(
 
     return result
 
+
+def fitness_bound(
+    item_values: NDArray,
+    units: NDArray,
+    num_hampers: int,
+    target_hamper_value: float,
+) -> float:
+    """Best possible fitness for a set of items.
+
+    Whatever the total value of the items is above or below what the hampers
+    should be worth has to end up in at least one hamper.
+    """
+    total_value = (item_values * units).sum()
+    return abs(total_value - num_hampers * target_hamper_value)
@@ -0,0 +1,49 @@
+import numpy as np
+
+from adaptive import AdaptiveController, OperatorScheduler
+from selection import fitness_calc
+
+
+def test_scheduler_tries_every_operator_first():
+    scheduler = OperatorScheduler(["a", "b", "c"])
+    chosen = []
+    for _ in range(3):
+        operator = scheduler.choose()
+        scheduler.record(operator, 0, 1)
+        chosen.append(operator)
+
+    assert chosen == ["a", "b", "c"]
+
+
+def test_scheduler_favours_productive_operator():
+    scheduler = OperatorScheduler(["slow", "fast"], min_probability=0.1)
+    scheduler.record("slow", 10, 1.0)
+    scheduler.record("fast", 10, 0.1)
+
+    # Same improvement in a tenth of the time
+    np.testing.assert_allclose(scheduler.probabilities, [0.1 + 0.8 / 11, 0.1 + 8 / 11])
+    np.testing.assert_allclose(scheduler.probabilities.sum(), 1)
+
+
+def test_controller_identical_parents():
+    # Crossover of identical parents can only reproduce them and with no
+    # mutation the offspring are copies of the parents
+    parent = np.array([[1, 1, 0, 0], [0, 1, 1, 0], [1, 0, 0, 1]])
+    price = np.array([4, 2, 1])
+    parents = [parent.copy() for _ in range(4)]
+    parent_fitness = np.full(4, fitness_calc(parent, price, 4))
+
+    controller = AdaptiveController(mutation_rate=0)
+    for _ in range(3):
+        mutants, fitness = controller.make_offspring(
+            parents, parent_fitness, 4, np.array([2, 2, 2]), price, 4
+        )
+
+        # Hamper values are 5, 6, 2 and 1
+        assert len(mutants) == 4
+        for chromosome in mutants:
+            np.testing.assert_array_equal(chromosome, parent)
+        np.testing.assert_array_equal(fitness, [8, 8, 8, 8])
+
+    # Neither operator made an improvement
+    np.testing.assert_array_equal(controller.crossover.rates, [0, 0])
@@ -0,0 +1,63 @@
+import numpy as np
+
+from annealing import anneal, move_delta
+from fixed_point import to_fixed_point, from_fixed_point
+from selection import fitness_calc
+
+
+def test_move_delta():
+    # Hampers worth 9 and 3 with a target of 6, moving a unit worth 3
+    # takes both hampers to the target so fitness drops from 6 to 0
+    result = move_delta(np.array([9]), np.array([3]), np.array([3]), 6)
+    np.testing.assert_array_equal(result, [-6])
+
+
+def test_anneal():
+    # Items worth 5, 3 and 2 split perfectly into two hampers worth 5
+    item_values = np.array([5, 3, 2])
+    start = np.array([[1, 0], [1, 0], [0, 1]])
+
+    best, best_fitness = anneal([start] * 4, item_values, 5, 200, 2, 0.1, seed=0)
+
+    assert best.shape == (4, 3, 2)
+    assert best_fitness.min() == 0
+    assert all(best_fitness <= fitness_calc(start, item_values, 5))
+    for chromosome, fitness in zip(best, best_fitness):
+        np.testing.assert_array_equal(chromosome.sum(axis=1), [1, 1, 1])
+        assert fitness == fitness_calc(chromosome, item_values, 5)
+
+
+def test_anneal_float_fitness_is_exact():
+    # Tenths can't be represented exactly so incremental fitness drifts
+    item_values = np.array([0.1, 0.2, 0.3, 0.7])
+    start = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 0]])
+
+    best, best_fitness = anneal([start] * 3, item_values, 0.45, 2000, 1, 0.01, seed=1)
+
+    for chromosome, fitness in zip(best, best_fitness):
+        assert fitness == fitness_calc(chromosome, item_values, 0.45)
+
+
+def test_anneal_fixed_point_matches_float():
+    # Quarters are exact in binary so float and fixed-point runs see the same
+    # deltas once the prices, target and temperatures are all scaled
+    item_values = np.array([1.25, 0.75, 0.5, 2.0])
+    start = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 0]])
+
+    float_best, float_fitness = anneal(
+        [start] * 3, item_values, 2.25, 500, 1.0, 0.05, seed=2
+    )
+    fixed_best, fixed_fitness = anneal(
+        [start.astype(np.int8)] * 3,
+        to_fixed_point(item_values),
+        to_fixed_point(2.25),
+        500,
+        to_fixed_point(1.0),
+        to_fixed_point(0.05),
+        seed=2,
+    )
+
+    # Same moves were accepted so the chains ended in the same place
+    assert not np.array_equal(float_best[0], start)
+    np.testing.assert_array_equal(fixed_best, float_best)
+    np.testing.assert_array_equal(from_fixed_point(fixed_fitness), float_fitness)
@@ -0,0 +1,24 @@
+import numpy as np
+
+from fixed_point import GENE_DTYPE, to_fixed_point, from_fixed_point
+from selection import fitness_calc
+
+
+def test_to_fixed_point():
+    result = to_fixed_point([710.0, 0.1, 0.2, 1189.0])
+
+    assert result.dtype == np.int64
+    np.testing.assert_array_equal(result, [71000, 10, 20, 118900])
+    np.testing.assert_array_equal(from_fixed_point(result), [710, 0.1, 0.2, 1189])
+
+
+def test_fitness_is_exact_integer():
+    chromosome = np.array([[1, 1, 0], [0, 1, 1], [1, 0, 1]], dtype=GENE_DTYPE)
+    item_values = to_fixed_point([0.1, 0.2, 0.3])
+    target = to_fixed_point(0.3)
+
+    # Hamper values are 0.4, 0.3 and 0.5 so fitness should be exactly 0.3
+    result = fitness_calc(chromosome, item_values, target)
+
+    assert np.issubdtype(result.dtype, np.integer)
+    assert result == to_fixed_point(0.3)
@@ -1,3 +1,5 @@
+import numpy as np
+
 from initialise import randomly_distribute_item, make_random_chromosome
 
 
@@ -19,3 +21,10 @@ def test_make_random_chromosome():
     assert result.shape == (5, 25)
     assert all(result[i, :].sum() == units[i] for i in range(len(units)))
 
+
+def test_make_random_chromosome_dtype():
+    units = [5, 3, 5, 2, 10]
+    result = make_random_chromosome(25, units, np.int8)
+
+    assert result.dtype == np.int8
+    assert all(result.sum(axis=1) == units)
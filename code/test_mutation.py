@@ -15,3 +15,38 @@ def test_swap_gene():
     result = mutation.swap_gene(chromosome)
     np.testing.assert_array_equal(result, expected)
 
+
+def test_mutate_skips_chromosome_once():
+    offspring = [np.array([[1, 0, 1, 0], [0, 0, 1, 1]]) for _ in range(3)]
+
+    result = mutation.mutate(offspring, mutation_rate=0)
+
+    # Unmutated chromosomes are passed through once each
+    assert len(result) == 3
+    assert all(r is o for r, o in zip(result, offspring))
+
+
+def test_mutate_num_swaps(monkeypatch):
+    calls = []
+
+    def counting_swap(chromosome):
+        calls.append(chromosome)
+        return chromosome
+
+    monkeypatch.setattr(mutation, "swap_gene", counting_swap)
+    offspring = [np.array([[1, 0, 1, 0], [0, 0, 1, 1]]) for _ in range(2)]
+
+    result = mutation.mutate(offspring, mutation_rate=1, num_swaps=3)
+
+    assert len(result) == 2
+    assert len(calls) == 6
+
+
+def test_mutate_keeps_row_sums():
+    random.seed(0)
+    offspring = [np.array([[1, 0, 1, 0], [0, 0, 1, 1], [1, 1, 1, 0]]) for _ in range(5)]
+
+    result = mutation.mutate(offspring, mutation_rate=1, num_swaps=4)
+
+    for chromosome in result:
+        np.testing.assert_array_equal(chromosome.sum(axis=1), [2, 2, 3])
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from multiprocessing.shared_memory import SharedMemory
+
+import parallel
+from parallel import OffspringPool
+
+
+# Hamper values are 5, 6, 2 and 1
+PARENT = np.array([[1, 1, 0, 0], [0, 1, 1, 0], [1, 0, 0, 1]], dtype=np.int8)
+UNITS = np.array([2, 2, 2])
+PRICE = np.array([4, 2, 1])
+
+
+def test_offspring_pool():
+    # Identical parents can only reproduce themselves without mutation
+    parents = [PARENT.copy() for _ in range(6)]
+
+    with OffspringPool(
+        2, 6, 5, PARENT.shape, UNITS, PRICE, 4, mutation_rate=0, dtype=np.int8, seed=0
+    ) as pool:
+        for _ in range(3):
+            offspring, fitness = pool.make_offspring(parents)
+
+            # Pairs of parents make pairs of offspring
+            assert len(offspring) == 4
+            for chromosome in offspring:
+                assert chromosome.dtype == np.int8
+                np.testing.assert_array_equal(chromosome, PARENT)
+            np.testing.assert_array_equal(fitness, [8, 8, 8, 8])
+
+
+def test_offspring_pool_fractional_target():
+    parents = [PARENT.copy() for _ in range(4)]
+
+    # Integer prices with a fractional target must not truncate fitness
+    with OffspringPool(
+        2, 4, 4, PARENT.shape, UNITS, PRICE, 5.25, mutation_rate=0
+    ) as pool:
+        _, fitness = pool.make_offspring(parents)
+
+    assert fitness.dtype == np.float64
+    np.testing.assert_array_equal(fitness, [8.5, 8.5, 8.5, 8.5])
+
+
+def test_offspring_pool_releases_blocks_on_failure(monkeypatch):
+    created = []
+
+    def recording_shared_memory(*args, **kwargs):
+        block = SharedMemory(*args, **kwargs)
+        created.append(block.name)
+        return block
+
+    def failing_pool(*args, **kwargs):
+        raise OSError("no more processes")
+
+    monkeypatch.setattr(parallel, "SharedMemory", recording_shared_memory)
+    monkeypatch.setattr(parallel, "Pool", failing_pool)
+
+    with pytest.raises(OSError):
+        OffspringPool(2, 4, 4, PARENT.shape, UNITS, PRICE, 4)
+
+    # Parents, offspring and fitness blocks were all unlinked
+    assert len(created) == 3
+    for name in created:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
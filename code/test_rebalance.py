@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+import rebalance as rebalance_module
+from genetic_algorithm import run
+from rebalance import (
+    rebalance, rebalance_best, rebalance_pair, integer_prices, subset_sums, backtrack
+)
+from selection import fitness_calc
+
+
+# Hamper values are 5, 6, 2 and 1. With a target of 3 the best split is
+# 4, 4, 3 and 3 (fitness 2) which pairwise rebalancing finds.
+CHROMOSOME = np.array([[1, 1, 0, 0], [0, 1, 1, 0], [1, 0, 0, 1]])
+PRICE = np.array([4, 2, 1])
+
+
+def test_subset_sums():
+    weights = np.array([2, 3])
+    result = subset_sums(weights)
+
+    # Sums 0, 2, 3 and 5 can be made from both weights
+    np.testing.assert_array_equal(result[-1], [1, 0, 1, 1, 0, 1])
+    np.testing.assert_array_equal(backtrack(result, weights, 3), [0, 1])
+
+
+def test_rebalance_pair():
+    # Hamper values are 12 and 4 with a target of 8
+    chromosome = np.array([[1, 0], [1, 0], [1, 1], [0, 1]])
+    item_values = np.array([5, 3, 2, 2])
+
+    # Item 2 must stay in both hampers so the best split is 5 + 2 and 3 + 2 + 2
+    expected = np.array([[1, 0], [0, 1], [1, 1], [0, 1]])
+    result = rebalance_pair(chromosome, 0, 1, item_values, 8)
+
+    assert result
+    np.testing.assert_array_equal(chromosome, expected)
+    assert not rebalance_pair(chromosome, 0, 1, item_values, 8)
+
+
+def test_rebalance():
+    chromosome = np.array([
+        [1, 1, 0, 0],
+        [1, 0, 1, 0],
+        [1, 0, 0, 1],
+        [0, 1, 1, 1],
+    ])
+    item_values = np.array([40.0, 10.0, 30.0, 20.0])
+
+    # Total value is 270 so target of 67.5 can't be hit exactly
+    result = rebalance(chromosome, item_values, 67.5)
+
+    np.testing.assert_array_equal(result.sum(axis=1), chromosome.sum(axis=1))
+    assert fitness_calc(result, item_values, 67.5) < fitness_calc(
+        chromosome, item_values, 67.5
+    )
+
+
+def test_integer_prices():
+    # Integer prices with a whole target are already exact
+    prices, target = integer_prices(PRICE, 3)
+    assert prices is PRICE and target == 3
+
+    # Anything else is converted to hundredths, but only once
+    prices, target = integer_prices(PRICE, 3.5)
+    np.testing.assert_array_equal(prices, [400, 200, 100])
+    assert target == 350
+
+    prices, target = integer_prices(np.array([0.25, 1.5]), 2)
+    np.testing.assert_array_equal(prices, [25, 150])
+    assert target == 200
+
+
+def test_rebalance_best():
+    population = [CHROMOSOME.copy(), CHROMOSOME.copy()]
+    fitness = np.array([8, 9])
+
+    rebalance_best(population, fitness, PRICE, 3)
+
+    np.testing.assert_array_equal(fitness, [2, 9])
+    assert fitness_calc(population[0], PRICE, 3) == 2
+    np.testing.assert_array_equal(population[1], CHROMOSOME)
+
+
+def test_rebalance_best_keeps_fitter_solution(monkeypatch):
+    # Every unit in the first hamper is further from the target
+    worse = np.array([[1, 1, 0, 0], [1, 1, 0, 0], [1, 1, 0, 0]])
+    monkeypatch.setattr(rebalance_module, "rebalance", lambda *args: worse)
+
+    population = [CHROMOSOME.copy()]
+    fitness = np.array([8])
+    rebalance_best(population, fitness, PRICE, 3)
+
+    np.testing.assert_array_equal(population[0], CHROMOSOME)
+    np.testing.assert_array_equal(fitness, [8])
+
+
+def test_run_rebalance_every():
+    # Identical parents with no mutation can't improve without rebalancing
+    item_data = pd.DataFrame({
+        "item": ["A", "B", "C"],
+        "total units": [2, 2, 2],
+        "price per unit": PRICE,
+    })
+
+    def best_fitness(rebalance_every):
+        return run(
+            item_data, 4, 3, num_generations=5, mutation_rate=0, progress=False,
+            population=[CHROMOSOME.copy() for _ in range(4)],
+            rebalance_every=rebalance_every,
+        )[3]
+
+    assert best_fitness(0) == [8, 8, 8, 8, 8]
+    assert best_fitness(3) == [8, 8, 2]
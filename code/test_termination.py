@@ -0,0 +1,16 @@
+import numpy as np
+
+from termination import fitness_bound, terminate
+
+
+def test_terminate():
+    assert terminate(10, 10)
+    assert not terminate(11, 10)
+
+
+def test_fitness_bound():
+    item_values = np.array([710.0, 1300.0])
+    units = np.array([10, 5])
+
+    # Items are worth 13600 in total, 600 more than 2 hampers of 6500
+    assert fitness_bound(item_values, units, 2, 6500) == 600
@@ -0,0 +1,122 @@
+import os
+
+from tuning import (
+    SEARCH_SPACE,
+    sample_configs,
+    trial_score,
+    load_trial,
+    save_trial,
+    run_trials,
+    count_configs,
+)
+
+
+class RecordingPool:
+    """Runs no trials, just records which ones weren't found in the cache."""
+
+    def __init__(self, reached=True):
+        self.trials = []
+        self.reached = reached
+
+    def imap_unordered(self, func, trials):
+        self.trials.extend(trials)
+        result = {
+            "reached": self.reached, "seconds": 1.0, "generations": 1, "best_fitness": 0
+        }
+        return [(trial, result) for trial in trials]
+
+
+def make_instance(tmp_path):
+    item_file = tmp_path / "items.csv"
+    item_file.write_text("item,total units,price per unit\nTea,10,544.0\n")
+    os.makedirs(tmp_path / "cache")
+
+    return {"item_file": str(item_file), "num_hampers": 2, "target": 5000}
+
+
+def test_sample_configs():
+    configs = sample_configs(10, seed=0)
+
+    assert len(configs) == 10
+    assert all(c not in configs[i + 1:] for i, c in enumerate(configs))
+    for name, values in SEARCH_SPACE.items():
+        assert all(c[name] in values for c in configs if name in c)
+
+
+def test_sample_configs_adaptive_has_no_crossover():
+    # Asking for more than there are gives every distinct configuration
+    configs = sample_configs(1000, seed=0)
+
+    assert len(configs) == count_configs() == 4 * 3 * 3 * 3 * (2 + 1)
+    for config in configs:
+        assert ("crossover_name" in config) != config["adaptive"]
+
+
+def test_trial_score():
+    always_slow = [{"reached": True, "seconds": 2.0, "best_fitness": 10}] * 2
+    always_fast = [{"reached": True, "seconds": 1.0, "best_fitness": 10}] * 2
+    sometimes = [
+        {"reached": True, "seconds": 0.1, "best_fitness": 10},
+        {"reached": False, "seconds": 0.1, "best_fitness": 20},
+    ]
+
+    scores = [trial_score(r) for r in (sometimes, always_slow, always_fast)]
+    assert sorted(scores) == [scores[2], scores[1], scores[0]]
+
+
+def test_trial_cache(tmp_path):
+    trial = ({"item_file": "items.csv"}, {"pop_size": 50}, 10, 0, "abc")
+    result = {"reached": False, "seconds": 1.5, "generations": 10, "best_fitness": 20}
+
+    assert load_trial(str(tmp_path), trial) is None
+    save_trial(str(tmp_path), trial, result)
+    assert load_trial(str(tmp_path), trial) == result
+
+
+def test_changed_items_miss_cache(tmp_path):
+    instance = make_instance(tmp_path)
+    item_file = tmp_path / "items.csv"
+    configs = sample_configs(2, seed=0)
+    cache_dir = str(tmp_path / "cache")
+
+    pool = RecordingPool()
+    run_trials(pool, instance, configs, 10, 2, cache_dir)
+    assert len(pool.trials) == 4
+
+    # Nothing changed so every trial comes from the cache
+    pool = RecordingPool()
+    run_trials(pool, instance, configs, 10, 2, cache_dir)
+    assert len(pool.trials) == 0
+
+    # A late delivery changes the file in place
+    item_file.write_text("item,total units,price per unit\nTea,12,544.0\n")
+    pool = RecordingPool()
+    run_trials(pool, instance, configs, 10, 2, cache_dir)
+    assert len(pool.trials) == 4
+
+
+def test_earlier_rung_reused_when_bound_reached(tmp_path):
+    instance = make_instance(tmp_path)
+    configs = sample_configs(2, seed=0)
+    cache_dir = str(tmp_path / "cache")
+
+    run_trials(RecordingPool(reached=True), instance, configs, 10, 2, cache_dir)
+
+    # Trials that stopped at the bound would stop there again
+    pool = RecordingPool()
+    results = run_trials(pool, instance, configs, 30, 2, cache_dir, earlier_rungs=(10,))
+    assert len(pool.trials) == 0
+    assert all(r["reached"] for seeds in results for r in seeds)
+
+
+def test_earlier_rung_rerun_when_bound_not_reached(tmp_path):
+    instance = make_instance(tmp_path)
+    configs = sample_configs(2, seed=0)
+    cache_dir = str(tmp_path / "cache")
+
+    run_trials(RecordingPool(reached=False), instance, configs, 10, 2, cache_dir)
+
+    # More generations might get further so every trial is run again
+    pool = RecordingPool()
+    run_trials(pool, instance, configs, 30, 2, cache_dir, earlier_rungs=(10,))
+    assert len(pool.trials) == 4
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from warm_start import adapt_chromosome, warm_start_population, resolve
+
+
+def make_items(names, units, prices):
+    return pd.DataFrame({
+        "item": names,
+        "total units": units,
+        "price per unit": prices,
+    })
+
+
+def test_adapt_chromosome():
+    old_items = make_items(["A", "B", "C"], [2, 2, 1], [10, 5, 1])
+    chromosome = np.array([[1, 1, 0, 0], [0, 1, 1, 0], [0, 0, 0, 1]])
+
+    # A removed, an extra unit of B and a new item D
+    new_items = make_items(["B", "C", "D"], [3, 1, 1], [5, 1, 2])
+
+    # Hamper values before fixing are 0, 5, 5, 1 so the extra B goes in the
+    # first hamper and D goes in the last (now cheapest) hamper
+    expected = np.array([[1, 1, 1, 0], [0, 0, 0, 1], [0, 0, 0, 1]])
+    result = adapt_chromosome(chromosome, old_items, new_items)
+
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_warm_start_population():
+    old_items = make_items(["A", "B"], [2, 2], [10, 5])
+    chromosome = np.array([[1, 1, 0, 0], [0, 1, 1, 0]])
+    new_items = make_items(["A", "B"], [1, 2], [10, 5])
+
+    result = warm_start_population([chromosome], old_items, new_items, 5)
+
+    assert len(result) == 5
+    for solution in result:
+        np.testing.assert_array_equal(solution.sum(axis=1), [1, 2])
+
+
+def test_warm_start_population_empty_and_full_items():
+    old_items = make_items(["A", "B", "C"], [2, 4, 1], [10, 5, 1])
+    chromosome = np.array([[1, 1, 0, 0], [1, 1, 1, 1], [0, 0, 1, 0]])
+
+    # Late delivery means no units of A
+    new_items = make_items(["A", "B", "C"], [0, 4, 1], [10, 5, 1])
+
+    result = warm_start_population([chromosome], old_items, new_items, 5)
+
+    for solution in result:
+        np.testing.assert_array_equal(solution.sum(axis=1), [0, 4, 1])
+
+
+def test_adapt_chromosome_too_many_units():
+    old_items = make_items(["A"], [2], [10])
+    new_items = make_items(["A"], [5], [10])
+
+    with pytest.raises(ValueError):
+        adapt_chromosome(np.array([[1, 1, 0, 0]]), old_items, new_items)
+
+
+def test_warm_start_population_no_previous_solutions():
+    items = make_items(["A"], [2], [10])
+
+    with pytest.raises(ValueError):
+        warm_start_population([], items, items, 5)
+
+
+def test_resolve_stops_at_new_bound():
+    old_items = make_items(["A", "B"], [2, 2], [10000, 10000])
+    chromosome = np.array([[1, 1], [1, 1]])
+
+    # Extra item moves the bound from 0 to 5000
+    new_items = make_items(["A", "B", "C"], [2, 2, 1], [10000, 10000, 5000])
+
+    _, fitness, _, best_fitness = resolve(
+        [chromosome], old_items, new_items, 20000, pop_size=4,
+        num_generations=50, progress=False,
+    )
+
+    assert len(best_fitness) == 1
+    assert fitness.min() == 5000
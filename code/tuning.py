@@ -0,0 +1,274 @@
+import hashlib
+import json
+import os
+import random
+from math import ceil
+from multiprocessing import Pool
+from time import perf_counter
+
+import pandas as pd
+import numpy as np
+
+from genetic_algorithm import run
+from termination import fitness_bound
+
+
+# Settings that are searched over and the values each one can take
+SEARCH_SPACE = {
+    "pop_size": [50, 100, 250, 500],
+    "parent_fraction": [0.3, 0.5, 0.7],
+    "mutation_rate": [0.2, 0.5, 0.8],
+    "crossover_name": ["onepoint", "twopoint"],
+    "adaptive": [False, True],
+    "rebalance_every": [0, 10, 50],
+}
+
+# Finished trials are stored here so tuning sessions can be resumed
+CACHE_DIR = "tuning_cache"
+
+
+def main():
+    # Each instance class is represented by one problem instance
+    instances = {
+        "15 items, 25 hampers": {
+            "item_file": "../CharityBulkPurchaseList.csv",
+            "num_hampers": 25,
+            "target": 5000,
+        },
+    }
+
+    best = tune(instances, num_workers=os.cpu_count())
+
+    for name, (config, score) in best.items():
+        print(name)
+        print(f"  reached bound in {score[0] * -100:.0f}% of runs")
+        print(f"  mean time {score[2]:.2f}s")
+        print(f"  {config}")
+
+
+def tune(
+    instances: dict,
+    num_configs: int = 27,
+    num_seeds: int = 3,
+    rungs: tuple = (50, 150, 500),
+    keep: float = 1 / 3,
+    num_workers: int | None = None,
+    cache_dir: str = CACHE_DIR,
+    seed: int | None = None,
+) -> dict:
+    """Find the fastest settings to reach the fitness bound for each instance class.
+
+    Random configurations are compared with successive halving. Every
+    configuration is run for the first number of generations in rungs, the
+    best fraction (keep) go on to the next rung and so on. Each configuration
+    is run once per seed and trials are spread across a process pool.
+
+    Args:
+        instances (dict): Instance class name mapped to a problem instance with
+            "item_file", "num_hampers" and "target" keys.
+        num_configs (int): Number of random configurations to start with.
+        num_seeds (int): Number of repeated runs of each configuration.
+        rungs (tuple): Maximum number of generations at each rung.
+        keep (float): Fraction of configurations that go on to the next rung.
+        num_workers (int | None): Number of processes (default all cores).
+        cache_dir (str): Directory that finished trials are cached in.
+        seed (int | None): Seed used to sample configurations.
+    Return:
+        dict: Instance class name mapped to the best configuration and its score.
+    """
+    configs = sample_configs(num_configs, seed)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    best = {}
+    with Pool(num_workers) as pool:
+        for name, instance in instances.items():
+            survivors = configs
+            for i, num_generations in enumerate(rungs):
+                results = run_trials(
+                    pool, instance, survivors, num_generations, num_seeds, cache_dir,
+                    earlier_rungs=rungs[0:i],
+                )
+                scores = [trial_score(r) for r in results]
+
+                # Keep the best configurations for the next rung
+                order = sorted(range(len(scores)), key=lambda i: scores[i])
+                num_keep = max(1, ceil(len(survivors) * keep))
+                survivors = [survivors[i] for i in order[0:num_keep]]
+                best[name] = (survivors[0], scores[order[0]])
+
+    return best
+
+
+def sample_configs(num_configs: int, seed: int | None = None) -> list[dict]:
+    """Sample distinct random configurations from the search space.
+
+    Adaptive mode chooses its own crossover operator so crossover_name is
+    dropped from adaptive configurations, otherwise configurations that run
+    identically would be tried more than once.
+    """
+    rng = random.Random(seed)
+    num_possible = count_configs()
+
+    configs = []
+    while len(configs) < min(num_configs, num_possible):
+        config = {name: rng.choice(values) for name, values in SEARCH_SPACE.items()}
+        if config["adaptive"]:
+            del config["crossover_name"]
+        if config not in configs:
+            configs.append(config)
+
+    return configs
+
+
+def count_configs() -> int:
+    # Adaptive configurations don't have a crossover_name
+    num_others = np.prod([
+        len(values) for name, values in SEARCH_SPACE.items()
+        if name not in ("crossover_name", "adaptive")
+    ])
+    num_crossovers = len(SEARCH_SPACE["crossover_name"])
+
+    return int(sum(
+        num_others * (1 if adaptive else num_crossovers)
+        for adaptive in SEARCH_SPACE["adaptive"]
+    ))
+
+
+def run_trials(
+    pool,
+    instance: dict,
+    configs: list[dict],
+    num_generations: int,
+    num_seeds: int,
+    cache_dir: str,
+    earlier_rungs: tuple = (),
+) -> list[list[dict]]:
+    """Run every configuration once per seed, reusing cached trials.
+
+    A trial that reached the bound at an earlier rung stopped there, so it
+    would stop at the same point with more generations and is reused too.
+    """
+    # Item files are edited in place so cached trials are tied to their contents
+    items_hash = file_hash(instance["item_file"])
+    trials = [
+        (instance, config, num_generations, seed, items_hash)
+        for config in configs
+        for seed in range(num_seeds)
+    ]
+
+    results = {}
+    to_run = []
+    for trial in trials:
+        cached = cached_result(cache_dir, trial, earlier_rungs)
+        if cached is None:
+            to_run.append(trial)
+        else:
+            results[trial_key(trial)] = cached
+
+    # Save each trial as soon as it finishes so an interrupted session
+    # loses as little work as possible
+    for trial, result in pool.imap_unordered(run_trial, to_run):
+        save_trial(cache_dir, trial, result)
+        results[trial_key(trial)] = result
+
+    return [
+        [results[trial_key(trial)] for trial in trials[i:i + num_seeds]]
+        for i in range(0, len(trials), num_seeds)
+    ]
+
+
+def cached_result(cache_dir: str, trial: tuple, earlier_rungs: tuple) -> dict | None:
+    result = load_trial(cache_dir, trial)
+    if result is not None:
+        return result
+
+    instance, config, _, seed, items_hash = trial
+    for num_generations in earlier_rungs:
+        earlier = load_trial(
+            cache_dir, (instance, config, num_generations, seed, items_hash)
+        )
+        if earlier is not None and earlier["reached"]:
+            return earlier
+
+    return None
+
+
+def run_trial(trial: tuple) -> tuple[tuple, dict]:
+    instance, config, num_generations, seed, _ = trial
+
+    # Operators use the random module so this makes repeated seeds differ
+    random.seed(seed)
+
+    item_data = pd.read_csv(instance["item_file"])
+    bound = fitness_bound(
+        item_data["price per unit"].values,         # type: ignore
+        item_data["total units"].values,            # type: ignore
+        instance["num_hampers"],
+        instance["target"],
+    )
+
+    start = perf_counter()
+    _, _, _, best_fitness = run(
+        item_data,
+        instance["num_hampers"],
+        instance["target"],
+        num_generations=num_generations,
+        target_fitness=bound,
+        progress=False,
+        **config,
+    )
+    seconds = perf_counter() - start
+
+    result = {
+        "reached": bool(best_fitness[-1] <= bound),
+        "seconds": seconds,
+        "generations": len(best_fitness),
+        "best_fitness": float(best_fitness[-1]),
+    }
+
+    return trial, result
+
+
+def trial_score(results: list[dict]) -> tuple[float, float, float]:
+    """Score repeated trials of a configuration (smaller is better).
+
+    Configurations that reach the bound more often win, then the ones that got
+    closest to it. Configurations that always reach the bound tie on fitness so
+    the fastest of them wins.
+    """
+    reached = np.mean([r["reached"] for r in results])
+    seconds = np.mean([r["seconds"] for r in results])
+    best_fitness = np.mean([r["best_fitness"] for r in results])
+
+    return (-float(reached), float(best_fitness), float(seconds))
+
+
+def file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def trial_key(trial: tuple) -> str:
+    return hashlib.sha1(json.dumps(trial, sort_keys=True).encode()).hexdigest()
+
+
+def load_trial(cache_dir: str, trial: tuple) -> dict | None:
+    path = os.path.join(cache_dir, f"{trial_key(trial)}.json")
+    if not os.path.exists(path):
+        return None
+
+    with open(path) as f:
+        return json.load(f)["result"]
+
+
+def save_trial(cache_dir: str, trial: tuple, result: dict):
+    path = os.path.join(cache_dir, f"{trial_key(trial)}.json")
+
+    # Write then rename so an interrupted write can't leave a broken file
+    with open(f"{path}.tmp", "w") as f:
+        json.dump({"trial": trial, "result": result}, f)
+    os.replace(f"{path}.tmp", path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import pandas as pd
+import numpy as np
+from numpy.typing import NDArray
+
+from genetic_algorithm import run
+from mutation import swap_gene
+from onepoint_crossover import add_missing_items, remove_excess_items
+
+
+def resolve(
+    previous_best: list[NDArray],
+    old_item_data: pd.DataFrame,
+    new_item_data: pd.DataFrame,
+    target: float,
+    pop_size: int = 250,
+    **kwargs,
+) -> tuple[list[NDArray], NDArray, list, list]:
+    """Re-run the genetic algorithm after the items have changed.
+
+    Rather than starting from a random population the run is seeded with
+    solutions from a previous run that have been fixed to fit the new items.
+    Small changes to the items only need a few generations to re-converge.
+
+    Args:
+        previous_best (list[NDArray]): Best chromosome(s) from the previous run.
+        old_item_data (pd.DataFrame): Items the previous run was solved for.
+        new_item_data (pd.DataFrame): Items to solve for now.
+        target (float): Value each hamper should be worth.
+        pop_size (int): Number of solutions in the first generation.
+        **kwargs: Passed on to genetic_algorithm.run.
+    Return:
+        Same as genetic_algorithm.run.
+    """
+    population = warm_start_population(
+        previous_best,
+        old_item_data,
+        new_item_data,
+        pop_size,
+    )
+    num_hampers = population[0].shape[1]
+
+    return run(
+        new_item_data,
+        num_hampers,
+        target,
+        population=population,
+        **kwargs,
+    )
+
+
+def warm_start_population(
+    previous_best: list[NDArray],
+    old_item_data: pd.DataFrame,
+    new_item_data: pd.DataFrame,
+    pop_size: int,
+    num_swaps: int = 2,
+) -> list[NDArray]:
+    """Create a population from solutions to a previous version of the items.
+
+    The fixed previous solutions are kept as they are and the rest of the
+    population is filled with mutated copies of them for diversity.
+
+    Raises:
+        ValueError: If there are no previous solutions to start from.
+    """
+    if len(previous_best) == 0:
+        raise ValueError("At least one previous solution is needed to warm start")
+
+    seeds = [
+        adapt_chromosome(chromosome, old_item_data, new_item_data)
+        for chromosome in previous_best
+    ]
+
+    # Items in no hampers or in every hamper have nothing to swap
+    units = new_item_data["total units"].values     # type: ignore
+    swappable = (units > 0) & (units < seeds[0].shape[1])
+
+    population = list(seeds)
+    while len(population) < pop_size:
+        chromosome = seeds[len(population) % len(seeds)].copy()
+        chromosome[swappable] = mutate_rows(chromosome[swappable], num_swaps)
+        population.append(chromosome)
+
+    return population[0:pop_size]
+
+
+def mutate_rows(rows: NDArray, num_swaps: int) -> NDArray:
+    if rows.shape[0] == 0:
+        return rows
+
+    for _ in range(num_swaps):
+        rows = swap_gene(rows)
+
+    return rows
+
+
+def adapt_chromosome(
+    chromosome: NDArray,
+    old_item_data: pd.DataFrame,
+    new_item_data: pd.DataFrame,
+) -> NDArray:
+    """Fit a chromosome from a previous run to changed items.
+
+    - Items are matched between the old and new data by name
+    - Items that are still available keep their hamper assignments
+    - Removed items are dropped and new items start in no hampers
+    - Only items whose number of units no longer matches are fixed, by adding
+      units to the cheapest hampers or removing them from the most expensive
+
+    Args:
+        chromosome (NDArray): Solution for the old items.
+        old_item_data (pd.DataFrame): Items the chromosome was made for.
+        new_item_data (pd.DataFrame): Items the chromosome should fit.
+    Return:
+        NDArray: Valid solution for the new items.
+    Raises:
+        ValueError: If an item has more units than there are hampers.
+    """
+    old_rows = {name: i for i, name in enumerate(old_item_data["item"])}
+    units = new_item_data["total units"].values     # type: ignore
+    price = new_item_data["price per unit"].values  # type: ignore
+
+    num_hampers = chromosome.shape[1]
+    check_units(new_item_data, num_hampers)
+
+    # Keep the assignments of items that are still available
+    adapted = np.zeros((len(new_item_data), num_hampers), dtype=chromosome.dtype)
+    for i, name in enumerate(new_item_data["item"]):
+        if name in old_rows:
+            adapted[i, :] = chromosome[old_rows[name], :]
+
+    hamper_values = np.dot(price, adapted)
+    diffs = adapted.sum(axis=1) - units
+
+    for i in np.nonzero(diffs)[0]:
+        before = adapted[i, :].copy()
+
+        if diffs[i] > 0:
+            remove_excess_items(adapted[i, :], hamper_values, diffs[i])
+        else:
+            add_missing_items(adapted[i, :], hamper_values, abs(diffs[i]))
+
+        # Later fixes should see the values left by this one
+        hamper_values = hamper_values + price[i] * (adapted[i, :] - before)
+
+    return adapted
+
+
+def check_units(item_data: pd.DataFrame, num_hampers: int):
+    # A hamper can't hold more than one unit of an item
+    units = item_data["total units"].values         # type: ignore
+    too_many = item_data["item"].values[units > num_hampers].tolist()
+
+    if too_many:
+        raise ValueError(
+            f"Items have more units than the {num_hampers} hampers: {too_many}"
+        )